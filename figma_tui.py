@@ -8,31 +8,88 @@ import os
 import json
 import sys
 import argparse
+import functools
+import time
+import uuid
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import unquote
+from urllib3.util.retry import Retry
+from urllib3.util.ssl_ import create_urllib3_context
 import re
+import shutil
+import string
 
 # SSL関連の警告を抑制
 warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*Event loop is closed.*")
 warnings.filterwarnings("ignore", category=ResourceWarning, message=".*unclosed.*")
 
+# 高速なJSONエンコーダ/デコーダ（任意）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 大きなJSONファイルの逐次パース用（任意）
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # TUI用ライブラリ
 try:
     import curses
 except ImportError:
     curses = None
-from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, TextColumn, BarColumn, TimeRemainingColumn
-from rich.prompt import Prompt, Confirm
-from rich.text import Text
-from rich.panel import Panel
-from rich.layout import Layout
-from rich.live import Live
-from rich.align import Align
+# Richは起動時間を抑えるため使用箇所で読み込む（--help などでは読み込まない）
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+# Figma API呼び出しの同時実行数
+API_WORKERS = 10
+# 画像ダウンロードの同時実行数
+DOWNLOAD_WORKERS = 8
+# このサイズ（バイト）以下の画像はメモリに読み込んでから一括で書き込む
+# （同時実行数ぶん同時に保持されるため、ピークメモリを抑えられる大きさにする）
+IN_MEMORY_DOWNLOAD_LIMIT = 1024 * 1024
+# 画像をディスクへコピーする単位（バイト）
+DOWNLOAD_CHUNK_SIZE = 262144
+# 画像ダウンロードの結果
+FETCH_DOWNLOADED = "downloaded"
+FETCH_UNCHANGED = "unchanged"
+FETCH_FAILED = "failed"
+# 進捗バーの表示名を更新する間隔（件数）
+PROGRESS_NAME_INTERVAL = 8
+# HTTPタイムアウト（接続, 読み込み）秒
+HTTP_TIMEOUT = (5, 30)
+# 画像ダウンロード用のタイムアウト（接続, 読み込み）秒
+DOWNLOAD_TIMEOUT = (5, 60)
+# FigmaのURL・ファイル名処理用の正規表現
+_FILE_RE = re.compile(r"figma\.com/(?:file|design)/([a-zA-Z0-9]{22})")
+_NODE_RE = re.compile(r"node-id=([^&]+)")
+_SAFE_NAME_RE = re.compile(r'[^\w\-_\.]')
+# Figmaのパーソナルアクセストークンの形式
+_TOKEN_RE = re.compile(r'(figd_|figu_)?[A-Za-z0-9_-]{40,}')
+# ASCIIのみの名前は正規表現を使わずbytes.translateで置換する
+_SAFE_NAME_TABLE = bytes(
+    b if chr(b) in string.ascii_letters + string.digits + '_-.' else ord('_')
+    for b in range(256)
+)
+# このサイズ（バイト）を超えるJSONファイルはijsonで逐次パースする
+STREAM_JSON_THRESHOLD = 1_000_000
+# JSONパース時に発生しうる例外
+_JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
+# URLsファイルの読み込み失敗として扱う例外
+_URLS_ERRORS = (FileNotFoundError,) + _JSON_ERRORS
+# Figma APIの1リクエストで問い合わせるノード数の上限
+IMAGE_IDS_BATCH_SIZE = 50
+# 取得済み画像URLを再利用する秒数（デザイン更新が反映されるよう短めにする）
+IMAGE_URL_CACHE_TTL = 300
 
 # クロスプラットフォーム対応の一文字入力
 def getch():
@@ -55,7 +112,114 @@ def getch():
             return ch
         except (ImportError, Exception):
             # フォールバック: 通常の入力
-            return input().strip()[:1] if input().strip() else '\n'
+            response = input().strip()
+            return response[:1] if response else '\n'
+
+def _json_loads(data: bytes) -> Any:
+    """JSONをパース（orjsonがあれば使用）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """JSONを整形してUTF-8のバイト列に変換（orjsonがあれば使用）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _create_temp(path) -> Tuple[str, int]:
+    """保存先と同じディレクトリに一意な一時ファイルを作成（既存ファイルがあれば権限を引き継ぐ）"""
+    path = os.fspath(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = None
+    
+    tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    fd = os.open(tmp, flags, 0o666 if mode is None else mode)
+    if mode is not None:
+        # umaskで権限が狭まらないよう既存ファイルと同じ権限に揃える
+        try:
+            os.chmod(tmp, mode)
+        except OSError:
+            pass
+    return tmp, fd
+
+def _remove_quietly(path: str):
+    """ファイルを削除（存在しなくてもエラーにしない）"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _write_atomic(path: str, data: bytes):
+    """一時ファイルに書き込んでから置き換える（途中で中断されても壊れたファイルを残さない）"""
+    tmp, fd = _create_temp(path)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+
+def _iter_items(path):
+    """JSON配列の要素を順に返す（大きなファイルはijsonで逐次パース）"""
+    with open(path, 'rb') as f:
+        if ijson is not None and os.fstat(f.fileno()).st_size > STREAM_JSON_THRESHOLD:
+            yield from ijson.items(f, 'item')
+        else:
+            yield from _json_loads(f.read())
+
+@functools.lru_cache(maxsize=4096)
+def _extract_ids(figma_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """FigmaのURLからFile IDとNode IDを抽出（同じURLの再解析はキャッシュから返す）"""
+    # FigmaのURLでなければ正規表現を使わずに終了する
+    if 'figma.com' not in figma_url:
+        return None, None
+    
+    file_match = _FILE_RE.search(figma_url)
+    file_id = file_match.group(1) if file_match else None
+    
+    # よくある形（node-id=が1回だけ現れる）は文字列操作で取り出す
+    _, sep, rest = figma_url.partition('node-id=')
+    node_id = rest.partition('&')[0] if sep else None
+    if not node_id and sep:
+        node_match = _NODE_RE.search(figma_url)
+        node_id = node_match.group(1) if node_match else None
+    
+    # 古い形式のURLでは「1%3A2」のようにエンコードされているため元に戻す
+    if node_id:
+        node_id = unquote(node_id)
+    
+    return file_id, node_id
+
+def _safe_filename(name: str) -> str:
+    """ファイル名に使えない文字を '_' に置換"""
+    if name.isascii():
+        return name.encode('ascii').translate(_SAFE_NAME_TABLE).decode('ascii')
+    # 日本語など非ASCIIの単語文字は残す
+    return _SAFE_NAME_RE.sub('_', name)
+
+def _parse_selection(text: str, count: int) -> List[int]:
+    """「1,3,5-7」「all」形式の番号指定を0始まりのインデックスに変換"""
+    text = text.strip().lower()
+    if text in ("a", "all"):
+        return list(range(count))
+    
+    indices = []
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        start = int(start)
+        end = int(end) if sep else start
+        if not 1 <= start <= end <= count:
+            raise ValueError(f"範囲外の番号です: {part}")
+        indices.extend(range(start - 1, end))
+    
+    return sorted(set(indices))
 
 def get_single_key_input(prompt):
     """一文字入力のラッパー関数（エラーハンドリング付き）"""
@@ -68,28 +232,97 @@ def get_single_key_input(prompt):
         response = input().strip().lower()
         return response[0] if response else '\n'
 
+def _pause(prompt: str = "\n何かキーを押して続行..."):
+    """キーが1つ押されるまで待機（行入力を待たない）"""
+    get_single_key_input(prompt)
+    print()
+
+def _wait_enter(stdscr):
+    """Enterキーが押されるまでブロックして待機（curses版）"""
+    stdscr.nodelay(False)
+    while True:
+        key = stdscr.getch()
+        if key in (10, 13, curses.KEY_ENTER):
+            return
+
+
+class SharedSSLContextAdapter(HTTPAdapter):
+    """既定の証明書検証を行う接続で1つのSSLContextを使い回すHTTPAdapter
+    
+    通常は接続ごとにSSLContextが作られ、CA証明書バンドルも毎回読み込まれる。
+    同じCDNから多数の画像を取得する場合、この準備コストをホストごと1回に抑える。
+    verify=False や独自のCAパス、クライアント証明書を指定した接続は共有せず、
+    通常どおり接続ごとのSSLContextを使う（共有コンテキストを書き換えないため）。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._ssl_context = create_urllib3_context()
+        self._ssl_context.load_verify_locations(cafile=requests.certs.where())
+        super().__init__(*args, **kwargs)
+    
+    def _uses_shared_context(self, verify, cert) -> bool:
+        """共有コンテキストを使う接続か（既定の検証のみ）"""
+        return verify is True and cert is None
+    
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if self._uses_shared_context(verify, cert) and host_params.get("scheme") == "https":
+            pool_kwargs["ssl_context"] = self._ssl_context
+        return host_params, pool_kwargs
+    
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        # 既定のCA証明書は共有コンテキストに読み込み済みなので、接続ごとに読み直さない
+        if self._uses_shared_context(verify, cert) and getattr(conn, "conn_kw", {}).get("ssl_context") is self._ssl_context:
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
 
 class FigmaImageExporter:
     def __init__(self, figma_token: str = None, urls_file: str = "figma_urls.json", 
-                 output_file: str = "figma_images.json", assets_dir: str = "assets"):
+                 output_file: str = "figma_images.json", assets_dir: str = "assets",
+                 max_workers: int = DOWNLOAD_WORKERS):
         self.figma_token = figma_token
         self.urls_file = urls_file
         self.output_file = output_file
         self.assets_dir = assets_dir
+        self.max_workers = max(1, max_workers)
+        from rich.console import Console
         self.console = Console()
         self.config_file = "figma_config.json"
+        self.etag_file = ".figma_etags.json"
+        
+        # HTTP接続をスレッド間で使い回すためのセッション
+        # トークンはCDNへ送らないようFigma API呼び出し時のみ付与する
+        # 同時実行数よりプールが小さいと接続が捨てられて再接続になるため、同時実行数以上を確保する
+        self.session = requests.Session()
+        adapter = SharedSSLContextAdapter(
+            pool_connections=16,
+            pool_maxsize=max(32, self.max_workers, API_WORKERS),
+            max_retries=Retry(total=3, status_forcelist=[429, 500, 502, 503, 504], backoff_factor=0.3)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
-        # アセットディレクトリを作成
-        Path(self.assets_dir).mkdir(exist_ok=True)
+        # (file_id, node_id, format, scale) -> (画像URL, 取得時刻)
+        self._image_url_cache: Dict[tuple, tuple] = {}
+        # 出力ファイルのパース結果: (パス, mtime_ns, サイズ, データ)
+        self._image_data_cache: Optional[tuple] = None
         
         # 設定を読み込み
         self.load_config()
+        
+        # アセットディレクトリを作成（設定ファイルで指定された場合も含む）
+        self.set_assets_dir(self.assets_dir)
+        
+        # ダウンロード済み画像のETag/Last-Modifiedを読み込み
+        self.load_etags()
     
     def load_config(self):
         """設定ファイルを読み込む"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                config = _json_loads(f.read())
                 if not self.figma_token:
                     self.figma_token = config.get('figma_token', '')
                 self.urls_file = config.get('urls_file', self.urls_file)
@@ -110,136 +343,315 @@ class FigmaImageExporter:
             'assets_dir': self.assets_dir
         }
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            _write_atomic(self.config_file, _json_dumps(config))
         except Exception as e:
             self.console.print(f"[red]エラー: 設定の保存に失敗しました: {e}[/red]")
+    
+    def set_assets_dir(self, assets_dir: str):
+        """アセットディレクトリを設定して作成（Pathはダウンロードごとに作り直さず保持する）"""
+        self.assets_dir = assets_dir
+        self._assets_path = Path(assets_dir)
+        self._assets_path.mkdir(parents=True, exist_ok=True)
+    
+    def load_etags(self):
+        """ETagファイルを読み込む"""
+        self._etag_store: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.etag_file, 'rb') as f:
+                self._etag_store = _json_loads(f.read())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            self.console.print(f"[yellow]警告: {self.etag_file} のJSONフォーマットが正しくありません[/yellow]")
+    
+    def save_etags(self):
+        """ETagファイルを保存"""
+        try:
+            # 中断後もダウンロード中のスレッドが更新し得るため、複製してから書き出す
+            _write_atomic(self.etag_file, _json_dumps(dict(self._etag_store)))
+        except Exception as e:
+            self.console.print(f"[red]エラー: ETagの保存に失敗しました: {e}[/red]")
         
-    def load_urls(self) -> List[Dict[str, str]]:
-        """URLsファイルからFigma URLsを読み込む"""
+    def iter_urls(self):
+        """URLsファイルからFigma URLsを1件ずつ読み込む
+        
+        逐次パースでは途中の要素を返した後に構文エラーが見つかることがあるため、
+        読み込みに失敗した場合はエラーを表示したうえで例外をそのまま送出する。
+        """
         try:
-            with open(self.urls_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            yield from _iter_items(self.urls_file)
         except FileNotFoundError:
             self.console.print(f"[red]エラー: {self.urls_file} が見つかりません[/red]")
-            return []
-        except json.JSONDecodeError:
+            raise
+        except _JSON_ERRORS:
             self.console.print(f"[red]エラー: {self.urls_file} のJSONフォーマットが正しくありません[/red]")
+            raise
+    
+    def load_urls(self) -> List[Dict[str, str]]:
+        """URLsファイルからFigma URLsを読み込む"""
+        try:
+            return list(self.iter_urls())
+        except _URLS_ERRORS:
             return []
     
+    def _load_image_data(self) -> List[Dict[str, str]]:
+        """出力ファイルから画像URLsを読み込む（変更がなければ前回のパース結果を返す）"""
+        stat = os.stat(self.output_file)
+        cache = self._image_data_cache
+        if cache and cache[:3] == (self.output_file, stat.st_mtime_ns, stat.st_size):
+            return cache[3]
+        
+        with open(self.output_file, 'rb') as f:
+            image_data = _json_loads(f.read())
+        
+        self._image_data_cache = (self.output_file, stat.st_mtime_ns, stat.st_size, image_data)
+        return image_data
+    
     def save_image_urls(self, image_data: List[Dict[str, str]]):
         """画像URLsをJSONファイルに保存"""
+        self._image_data_cache = None
         try:
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(image_data, f, ensure_ascii=False, indent=2)
+            _write_atomic(self.output_file, _json_dumps(image_data))
             self.console.print(f"[green]画像URLsを {self.output_file} に保存しました[/green]")
         except Exception as e:
             self.console.print(f"[red]エラー: 画像URLsの保存に失敗しました: {e}[/red]")
     
     def extract_file_id_from_url(self, figma_url: str) -> tuple[Optional[str], Optional[str]]:
         """FigmaのURLからFile IDとNode IDを抽出"""
-        file_pattern = r"figma\.com/(?:file|design)/([a-zA-Z0-9]{22})"
-        file_match = re.search(file_pattern, figma_url)
+        return _extract_ids(figma_url)
+    
+    def get_image_urls(self, file_id: str, node_ids: List[str], format: str = "png", scale: int = 1,
+                       batch_size: int = IMAGE_IDS_BATCH_SIZE) -> Dict[str, str]:
+        """同じファイル内の複数ノードの画像URLをbatch_size件ずつまとめて取得"""
+        image_urls = {}
+        
+        # キャッシュ済みのノードはAPIに問い合わせない
+        now = time.monotonic()
+        formatted_ids = {}
+        for node_id in node_ids:
+            formatted_node_id = node_id.replace("-", ":")
+            cached = self._image_url_cache.get((file_id, formatted_node_id, format, scale))
+            if cached and now - cached[1] < IMAGE_URL_CACHE_TTL:
+                image_urls[node_id] = cached[0]
+            else:
+                formatted_ids[node_id] = formatted_node_id
         
-        node_pattern = r"node-id=([^&]+)"
-        node_match = re.search(node_pattern, figma_url)
+        if not formatted_ids:
+            return image_urls
         
-        file_id = file_match.group(1) if file_match else None
-        node_id = node_match.group(1) if node_match else None
+        pending = list(formatted_ids.items())
+        
+        # idsが長くなりすぎないよう、batch_size件ずつに分けて問い合わせる
+        for start in range(0, len(pending), batch_size):
+            self._request_image_batch(file_id, dict(pending[start:start + batch_size]), format, scale, now, image_urls)
         
-        return file_id, node_id
+        return image_urls
     
-    def get_image_url(self, file_id: str, node_id: str, format: str = "png", scale: int = 1) -> Optional[str]:
-        """指定したノードの画像URLを取得"""
+    def _request_image_batch(self, file_id: str, batch: Dict[str, str], format: str, scale: int,
+                             now: float, image_urls: Dict[str, str]):
+        """1回のAPI呼び出しでbatch（node_id -> 整形済みID）の画像URLを取得してimage_urlsに追加"""
         url = f"https://api.figma.com/v1/images/{file_id}"
         headers = {"X-Figma-Token": self.figma_token}
-        
-        formatted_node_id = node_id.replace("-", ":")
-        params = {"ids": formatted_node_id, "format": format, "scale": scale}
+        params = {"ids": ",".join(dict.fromkeys(batch.values())), "format": format, "scale": scale}
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             
             if data.get("err"):
                 self.console.print(f"[red]Figma APIエラー: {data['err']}[/red]")
-                return None
+                return
                 
-            images = data.get("images", {})
+            images = data.get("images") or {}
             
-            if node_id in images:
-                return images[node_id]
-            elif formatted_node_id in images:
-                return images[formatted_node_id]
-            else:
-                return None
+            for node_id, formatted_node_id in batch.items():
+                image_url = images.get(node_id) or images.get(formatted_node_id)
+                if image_url:
+                    image_urls[node_id] = image_url
+                    self._image_url_cache[(file_id, formatted_node_id, format, scale)] = (image_url, now)
                 
+        except requests.exceptions.HTTPError as e:
+            # 不正なノードIDが1つあるとバッチ全体が失敗するため、半分ずつに分けて問い合わせ直す
+            status = e.response.status_code if e.response is not None else None
+            if status in (400, 404) and len(batch) > 1:
+                items = list(batch.items())
+                middle = len(items) // 2
+                self._request_image_batch(file_id, dict(items[:middle]), format, scale, now, image_urls)
+                self._request_image_batch(file_id, dict(items[middle:]), format, scale, now, image_urls)
+            else:
+                self.console.print(f"[red]画像URL取得エラー: {e}[/red]")
         except requests.exceptions.RequestException as e:
             self.console.print(f"[red]画像URL取得エラー: {e}[/red]")
-            return None
+    
+    def get_image_url(self, file_id: str, node_id: str, format: str = "png", scale: int = 1) -> Optional[str]:
+        """指定したノードの画像URLを取得"""
+        return self.get_image_urls(file_id, [node_id], format, scale).get(node_id)
     
     def download_image(self, url: str, filename: str) -> bool:
         """画像をダウンロード"""
+        result, error = self._fetch_image(url, filename)
+        if result == FETCH_DOWNLOADED:
+            # 単独で呼ばれた場合も次回の条件付きリクエストに使えるよう記録を保存する
+            self.save_etags()
+        if error:
+            self.console.print(f"[red]画像ダウンロードエラー: {error}[/red]")
+        return result != FETCH_FAILED
+    
+    def _fetch_image(self, url: str, filename: str) -> Tuple[str, Optional[str]]:
+        """画像をダウンロードし、結果（FETCH_*）とエラー内容を返す（表示は呼び出し側で行う）"""
+        filepath = self._assets_path / filename
+        key = filepath.as_posix()
+        
+        # 前回ダウンロードを完了したファイルが手元で変わっていなければ条件付きリクエストにする
+        # （記録のないファイルは中身を確認できないため通常どおり取得する）
+        headers = {}
+        entry = self._etag_store.get(key)
+        if entry:
+            try:
+                stat = filepath.stat()
+            except OSError:
+                stat = None
+            if stat and stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns"):
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+        
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            filepath = Path(self.assets_dir) / filename
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            return True
+            # 例外時も含め、ストリーミング応答の接続を必ずプールへ返す
+            with self.session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                # 変更なし: 既存のファイルをそのまま使う
+                if response.status_code == 304:
+                    return FETCH_UNCHANGED, None
+                
+                response.raise_for_status()
+                
+                # 一時ファイルに書き終えてから置き換え、途中で失敗しても壊れた画像を残さない
+                tmp, fd = _create_temp(filepath)
+                try:
+                    with open(fd, 'wb') as f:
+                        content_length = int(response.headers.get("Content-Length") or 0)
+                        if 0 < content_length <= IN_MEMORY_DOWNLOAD_LIMIT:
+                            # 一般的なサイズの画像はまとめて読み込み、1回の書き込みで保存
+                            f.write(response.content)
+                        else:
+                            # 大きい・サイズ不明な画像は生ストリームから大きめの単位でコピー
+                            response.raw.decode_content = True
+                            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                    os.replace(tmp, filepath)
+                except BaseException:
+                    _remove_quietly(tmp)
+                    raise
+                
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    stat = filepath.stat()
+                    self._etag_store[key] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "size": stat.st_size,
+                        "mtime_ns": stat.st_mtime_ns
+                    }
+                else:
+                    self._etag_store.pop(key, None)
+                
+                return FETCH_DOWNLOADED, None
         except Exception as e:
-            self.console.print(f"[red]画像ダウンロードエラー: {e}[/red]")
-            return False
+            return FETCH_FAILED, str(e)
     
-    def process_urls(self) -> List[Dict[str, str]]:
-        """URLsを処理して画像URLsを取得"""
-        urls_data = self.load_urls()
-        if not urls_data:
-            return []
+    def _create_progress(self) -> "Progress":
+        """進捗バーを作成（再描画は控えめにしてループ側の負荷を抑える）"""
+        from rich.progress import Progress, TextColumn, BarColumn, TimeRemainingColumn
         
-        image_data = []
-        
-        with Progress(
+        return Progress(
             TextColumn("[bold blue]{task.fields[name]}[/bold blue]"),
             BarColumn(),
             "[progress.percentage]{task.percentage:>3.1f}%",
             "•",
             TimeRemainingColumn(),
-            console=self.console
-        ) as progress:
-            
-            task = progress.add_task("画像URL取得中", total=len(urls_data), name="Processing")
-            
-            for item in urls_data:
+            console=self.console,
+            refresh_per_second=4
+        )
+    
+    def process_urls(self) -> List[Dict[str, str]]:
+        """URLsを処理して画像URLsを取得"""
+        # 形式の正しくないトークンではAPIを呼ばずに終了する
+        if not self.figma_token or not _TOKEN_RE.fullmatch(self.figma_token):
+            self.console.print("[red]エラー: Figma Tokenが未設定か、形式が正しくありません[/red]")
+            return []
+        
+        # 完了順に届く結果を元の並び順で保持する
+        results: List[Optional[Dict[str, str]]] = []
+        
+        # URLsファイルを逐次読みながら、同じファイルのノードを1回のAPI呼び出しにまとめる
+        groups: Dict[str, List[tuple]] = {}
+        invalid_count = 0
+        try:
+            for index, item in enumerate(self.iter_urls()):
+                results.append(None)
                 name = item.get("name", "Unknown")
                 url = item.get("url", "")
                 
-                progress.update(task, name=f"Processing: {name}")
-                
                 file_id, node_id = self.extract_file_id_from_url(url)
                 
                 if file_id and node_id:
-                    image_url = self.get_image_url(file_id, node_id)
-                    if image_url:
-                        image_data.append({
-                            "name": name,
-                            "url": image_url,
-                            "original_url": url
-                        })
-                    else:
-                        self.console.print(f"[yellow]⚠ {name}: 画像URL取得失敗[/yellow]")
+                    groups.setdefault(file_id, []).append((index, name, node_id, url))
                 else:
                     self.console.print(f"[red]✗ {name}: 無効なFigma URL[/red]")
+                    invalid_count += 1
+        except _URLS_ERRORS:
+            # 途中まで読めていても一部だけの結果で出力ファイルを上書きしない
+            return []
+        
+        if not results:
+            return []
+        
+        with self._create_progress() as progress:
+            
+            task = progress.add_task("画像URL取得中", total=len(results), name="Processing")
+            progress.advance(task, invalid_count)
+            
+            # API呼び出しはファイルごとに独立しているのでスレッドで並列に実行
+            executor = ThreadPoolExecutor(max_workers=API_WORKERS)
+            try:
+                # ノードの多いファイルはバッチに分け、バッチ同士も並列に問い合わせる
+                futures = {}
+                for file_id, entries in groups.items():
+                    for start in range(0, len(entries), IMAGE_IDS_BATCH_SIZE):
+                        batch = entries[start:start + IMAGE_IDS_BATCH_SIZE]
+                        future = executor.submit(self.get_image_urls, file_id, [entry[2] for entry in batch])
+                        futures[future] = batch
                 
-                progress.advance(task)
+                for future in as_completed(futures):
+                    entries = futures[future]
+                    image_urls = future.result()
+                    
+                    for index, name, node_id, url in entries:
+                        image_url = image_urls.get(node_id)
+                        if image_url:
+                            results[index] = {
+                                "name": name,
+                                "url": image_url,
+                                "original_url": url
+                            }
+                        else:
+                            self.console.print(f"[yellow]⚠ {name}: 画像URL取得失敗[/yellow]")
+                    
+                    # 表示の更新はファイル単位でまとめて行う
+                    progress.update(task, advance=len(entries), name=f"Processing: {entries[-1][1]}")
+            except BaseException:
+                # Ctrl-Cなどで中断されたら、待機中のAPI呼び出しを取り消してすぐに抜ける
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+        
+        image_data = [result for result in results if result]
         
         # 結果サマリーを表示
         if image_data:
-            self.console.print(f"\n[green]✓ {len(image_data)}/{len(urls_data)} 個の画像URL取得完了[/green]")
+            self.console.print(f"\n[green]✓ {len(image_data)}/{len(results)} 個の画像URL取得完了[/green]")
         else:
             self.console.print(f"\n[red]✗ 画像URL取得に失敗しました[/red]")
         
@@ -251,37 +663,62 @@ class FigmaImageExporter:
             self.console.print("[yellow]ダウンロードする画像がありません[/yellow]")
             return
         
+        # ファイル名を生成（安全な文字のみ）
+        # 同名ファイルへの同時書き込みを避けるため、後勝ちで1件にまとめる
+        jobs = {}
+        for item in image_data:
+            name = item.get("name", "Unknown")
+            jobs[f"{_safe_filename(name)}.png"] = (name, item.get("url", ""))
+        
         success_count = 0
+        unchanged_count = 0
+        errors = []
         
-        with Progress(
-            TextColumn("[bold blue]{task.fields[name]}[/bold blue]"),
-            BarColumn(),
-            "[progress.percentage]{task.percentage:>3.1f}%",
-            "•",
-            TimeRemainingColumn(),
-            console=self.console
-        ) as progress:
-            
-            task = progress.add_task("画像ダウンロード中", total=len(image_data), name="Downloading")
-            
-            for item in image_data:
-                name = item.get("name", "Unknown")
-                url = item.get("url", "")
-                
-                progress.update(task, name=f"Downloading: {name}")
-                
-                # ファイル名を生成（安全な文字のみ）
-                safe_name = re.sub(r'[^\w\-_\.]', '_', name)
-                filename = f"{safe_name}.png"
+        try:
+            with self._create_progress() as progress:
                 
-                if self.download_image(url, filename):
-                    success_count += 1
+                task = progress.add_task("画像ダウンロード中", total=len(jobs), name="Downloading")
                 
-                progress.advance(task)
+                # 各ダウンロードはI/O待ちが支配的なのでスレッドで並列に実行
+                executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                try:
+                    futures = {
+                        executor.submit(self._fetch_image, url, filename): name
+                        for filename, (name, url) in jobs.items()
+                    }
+                    
+                    for done, future in enumerate(as_completed(futures), 1):
+                        result, error = future.result()
+                        if result != FETCH_FAILED:
+                            success_count += 1
+                        if result == FETCH_UNCHANGED:
+                            unchanged_count += 1
+                        if error:
+                            # 進捗バーの描画中には出力せず、完了後にまとめて表示する
+                            errors.append((futures[future], error))
+                        
+                        # 表示名の更新は数件おきに間引く
+                        if done % PROGRESS_NAME_INTERVAL == 0 or done == len(futures):
+                            progress.update(task, name=f"Downloading: {futures[future]}")
+                        
+                        progress.advance(task)
+                except BaseException:
+                    # Ctrl-Cなどで中断されたら、待機中のダウンロードを取り消してすぐに抜ける
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                executor.shutdown()
+        finally:
+            # 中断された場合も、完了した分のETagは保存する
+            self.save_etags()
+        
+        for name, error in errors:
+            self.console.print(f"[red]画像ダウンロードエラー: {name}: {error}[/red]")
         
         # 結果サマリーを表示
         if success_count > 0:
-            self.console.print(f"\n[green]✓ {success_count}/{len(image_data)} 個の画像ダウンロード完了[/green]")
+            self.console.print(f"\n[green]✓ {success_count}/{len(jobs)} 個の画像ダウンロード完了[/green]")
+            if unchanged_count:
+                self.console.print(f"[dim]  うち {unchanged_count} 個は変更がなかったため既存のファイルを使用しました[/dim]")
         else:
             self.console.print(f"\n[red]✗ 画像ダウンロードに失敗しました[/red]")
     
@@ -299,35 +736,52 @@ class FigmaImageExporter:
         ]
         
         current_pos = 0
+        full_redraw = True
+        dirty_rows = set()
+        
+        def draw_row(i):
+            """メニュー項目を1行だけ描画"""
+            y = 5 + i * 2
+            label = menu_items[i][0]
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            if i == current_pos:
+                stdscr.addstr(y, 4, f"► {label}", curses.A_REVERSE)
+            else:
+                stdscr.addstr(y, 4, f"  {label}")
         
         while True:
-            stdscr.clear()
-            height, width = stdscr.getmaxyx()
-            
-            # タイトル
-            title = "🎨 Figma Image Exporter TUI"
-            stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
-            
-            # メニュー表示
-            for i, (label, _) in enumerate(menu_items):
-                y = 5 + i * 2
-                if i == current_pos:
-                    stdscr.addstr(y, 4, f"► {label}", curses.A_REVERSE)
-                else:
-                    stdscr.addstr(y, 4, f"  {label}")
-            
-            # 設定情報表示
-            settings_y = 5 + len(menu_items) * 2 + 2
-            stdscr.addstr(settings_y, 4, "⚙️ Current Settings:", curses.A_BOLD)
-            stdscr.addstr(settings_y + 1, 6, f"URLs File: {self.urls_file}")
-            stdscr.addstr(settings_y + 2, 6, f"Output File: {self.output_file}")
-            stdscr.addstr(settings_y + 3, 6, f"Assets Directory: {self.assets_dir}")
-            stdscr.addstr(settings_y + 4, 6, f"Figma Token: {'設定済み' if self.figma_token else '未設定'}")
-            
-            # キー操作ヘルプ
-            help_y = height - 3
-            stdscr.addstr(help_y, 4, "j/k: 上下移動, Space/Enter: 決定, q: 終了", curses.A_DIM)
+            if full_redraw:
+                stdscr.clear()
+                height, width = stdscr.getmaxyx()
+                
+                # タイトル
+                title = "🎨 Figma Image Exporter TUI"
+                stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
+                
+                # メニュー表示
+                for i in range(len(menu_items)):
+                    draw_row(i)
+                
+                # 設定情報表示
+                settings_y = 5 + len(menu_items) * 2 + 2
+                stdscr.addstr(settings_y, 4, "⚙️ Current Settings:", curses.A_BOLD)
+                stdscr.addstr(settings_y + 1, 6, f"URLs File: {self.urls_file}")
+                stdscr.addstr(settings_y + 2, 6, f"Output File: {self.output_file}")
+                stdscr.addstr(settings_y + 3, 6, f"Assets Directory: {self.assets_dir}")
+                stdscr.addstr(settings_y + 4, 6, f"Figma Token: {'設定済み' if self.figma_token else '未設定'}")
+                
+                # キー操作ヘルプ
+                help_y = height - 3
+                stdscr.addstr(help_y, 4, "j/k: 上下移動, Space/Enter: 決定, q: 終了", curses.A_DIM)
+                
+                full_redraw = False
+            else:
+                # カーソル移動で変化した行だけを描き直す
+                for i in dirty_rows:
+                    draw_row(i)
             
+            dirty_rows = set()
             stdscr.refresh()
             
             # キー入力処理
@@ -336,9 +790,15 @@ class FigmaImageExporter:
             if key == ord('q') or key == ord('Q'):
                 break
             elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos + 1) % len(menu_items)
+                dirty_rows.add(current_pos)
             elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos - 1) % len(menu_items)
+                dirty_rows.add(current_pos)
+            elif key == curses.KEY_RESIZE:
+                full_redraw = True
             elif key == ord('\n') or key == 10 or key == ord(' '):
                 selected_action = menu_items[current_pos][1]
                 if selected_action == "quit":
@@ -351,6 +811,8 @@ class FigmaImageExporter:
                     self.curses_download_all(stdscr)
                 elif selected_action == "settings":
                     self.curses_settings(stdscr)
+                # サブ画面から戻ったら全体を描き直す
+                full_redraw = True
     
     def curses_get_urls(self, stdscr):
         """URLsから画像リンクを取得（curses版）"""
@@ -368,7 +830,7 @@ class FigmaImageExporter:
             else:
                 self.console.print("[red]✗ 画像リンクの取得に失敗しました[/red]")
             
-            input("\nエンターキーで続行...")
+            _pause()
         finally:
             # cursesモードを再開
             stdscr.refresh()
@@ -376,24 +838,21 @@ class FigmaImageExporter:
     def curses_download_selected(self, stdscr):
         """選択して画像をダウンロード（curses版）"""
         try:
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                image_data = json.load(f)
+            image_data = self._load_image_data()
         except FileNotFoundError:
             stdscr.clear()
             stdscr.addstr(1, 4, f"エラー: {self.output_file} が見つかりません", curses.A_BOLD)
             stdscr.addstr(2, 4, "まず画像リンクを取得してください")
             stdscr.addstr(4, 4, "エンターキーで続行...")
             stdscr.refresh()
-            while stdscr.getch() not in [ord('\n'), 10]:
-                pass
+            _wait_enter(stdscr)
             return
         except json.JSONDecodeError:
             stdscr.clear()
             stdscr.addstr(1, 4, f"エラー: {self.output_file} のJSONフォーマットが正しくありません", curses.A_BOLD)
             stdscr.addstr(3, 4, "エンターキーで続行...")
             stdscr.refresh()
-            while stdscr.getch() not in [ord('\n'), 10]:
-                pass
+            _wait_enter(stdscr)
             return
         
         # チェックボックス選択画面
@@ -409,8 +868,7 @@ class FigmaImageExporter:
                 
                 self.download_images(selected_items)
                 
-                self.console.print(f"[green]✓ {len(selected_items)} 個の画像をダウンロードしました[/green]")
-                input("\nエンターキーで続行...")
+                _pause()
             finally:
                 # cursesモードを再開
                 stdscr.refresh()
@@ -418,24 +876,21 @@ class FigmaImageExporter:
     def curses_download_all(self, stdscr):
         """すべての画像をダウンロード（curses版）"""
         try:
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                image_data = json.load(f)
+            image_data = self._load_image_data()
         except FileNotFoundError:
             stdscr.clear()
             stdscr.addstr(1, 4, f"エラー: {self.output_file} が見つかりません", curses.A_BOLD)
             stdscr.addstr(2, 4, "まず画像リンクを取得してください")
             stdscr.addstr(4, 4, "エンターキーで続行...")
             stdscr.refresh()
-            while stdscr.getch() not in [ord('\n'), 10]:
-                pass
+            _wait_enter(stdscr)
             return
         except json.JSONDecodeError:
             stdscr.clear()
             stdscr.addstr(1, 4, f"エラー: {self.output_file} のJSONフォーマットが正しくありません", curses.A_BOLD)
             stdscr.addstr(3, 4, "エンターキーで続行...")
             stdscr.refresh()
-            while stdscr.getch() not in [ord('\n'), 10]:
-                pass
+            _wait_enter(stdscr)
             return
         
         if not image_data:
@@ -443,8 +898,7 @@ class FigmaImageExporter:
             stdscr.addstr(1, 4, "ダウンロードする画像がありません", curses.A_BOLD)
             stdscr.addstr(3, 4, "エンターキーで続行...")
             stdscr.refresh()
-            while stdscr.getch() not in [ord('\n'), 10]:
-                pass
+            _wait_enter(stdscr)
             return
         
         # 確認ダイアログを表示
@@ -476,7 +930,7 @@ class FigmaImageExporter:
             
             self.download_images(image_data)
             
-            input("\nエンターキーで続行...")
+            _pause()
         finally:
             # cursesモードを再開
             stdscr.refresh()
@@ -489,52 +943,71 @@ class FigmaImageExporter:
         selected = [False] * len(items)
         current_pos = 0
         scroll_offset = 0
+        full_redraw = True
+        dirty_rows = set()
+        
+        def draw_row(item_index):
+            """アイテムを1行だけ描画"""
+            y = 4 + item_index - scroll_offset
+            name = items[item_index].get('name', 'Unknown')
+            
+            # チェックボックス
+            checkbox = "[✓]" if selected[item_index] else "[ ]"
+            
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            
+            # 現在選択中の項目をハイライト
+            if item_index == current_pos:
+                stdscr.addstr(y, 4, f"► {checkbox} {name}", curses.A_REVERSE)
+            else:
+                stdscr.addstr(y, 4, f"  {checkbox} {name}")
+        
+        def draw_status(status_y):
+            """選択済み数を表示"""
+            stdscr.move(status_y, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(status_y, 4, f"選択済み: {sum(selected)}/{len(items)}")
         
         while True:
-            stdscr.clear()
             height, width = stdscr.getmaxyx()
             
-            # タイトル
-            title = "画像を選択してください"
-            stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
-            
             # 表示可能な行数を計算
             display_height = height - 8  # ヘッダー・フッター用の余白
             
-            # スクロール処理
+            # スクロール処理（スクロールした場合は全体を描き直す）
             if current_pos < scroll_offset:
                 scroll_offset = current_pos
+                full_redraw = True
             elif current_pos >= scroll_offset + display_height:
                 scroll_offset = current_pos - display_height + 1
+                full_redraw = True
             
-            # アイテム表示
-            for i in range(min(display_height, len(items) - scroll_offset)):
-                item_index = scroll_offset + i
-                if item_index >= len(items):
-                    break
+            if full_redraw:
+                stdscr.clear()
                 
-                y = 4 + i
-                item = items[item_index]
-                name = item.get('name', 'Unknown')
+                # タイトル
+                title = "画像を選択してください"
+                stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
                 
-                # チェックボックス
-                checkbox = "[✓]" if selected[item_index] else "[ ]"
+                # アイテム表示
+                for i in range(min(display_height, len(items) - scroll_offset)):
+                    draw_row(scroll_offset + i)
                 
-                # 現在選択中の項目をハイライト
-                if item_index == current_pos:
-                    stdscr.addstr(y, 4, f"► {checkbox} {name}", curses.A_REVERSE)
-                else:
-                    stdscr.addstr(y, 4, f"  {checkbox} {name}")
-            
-            # 選択済み数を表示
-            selected_count = sum(selected)
-            status_y = height - 4
-            stdscr.addstr(status_y, 4, f"選択済み: {selected_count}/{len(items)}")
-            
-            # キー操作ヘルプ
-            help_y = height - 3
-            stdscr.addstr(help_y, 4, "j/k: 上下移動, Space: 選択切替, a: 全選択/解除, Enter: 決定, q: キャンセル", curses.A_DIM)
+                draw_status(height - 4)
+                
+                # キー操作ヘルプ
+                help_y = height - 3
+                stdscr.addstr(help_y, 4, "j/k: 上下移動, Space: 選択切替, a: 全選択/解除, Enter: 決定, q: キャンセル", curses.A_DIM)
+                
+                full_redraw = False
+            else:
+                # 変化した行と選択済み数だけを描き直す
+                for item_index in dirty_rows:
+                    draw_row(item_index)
+                draw_status(height - 4)
             
+            dirty_rows = set()
             stdscr.refresh()
             
             # キー入力処理
@@ -543,15 +1016,23 @@ class FigmaImageExporter:
             if key == ord('q') or key == ord('Q'):
                 return []
             elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos + 1) % len(items)
+                dirty_rows.add(current_pos)
             elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos - 1) % len(items)
+                dirty_rows.add(current_pos)
             elif key == ord(' '):
                 selected[current_pos] = not selected[current_pos]
+                dirty_rows.add(current_pos)
             elif key == ord('a') or key == ord('A'):
                 # 全選択/全解除の切り替え
                 all_selected = all(selected)
                 selected = [not all_selected] * len(items)
+                full_redraw = True
+            elif key == curses.KEY_RESIZE:
+                full_redraw = True
             elif key == ord('\n') or key == 10:
                 # 選択された項目を返す
                 return [items[i] for i, sel in enumerate(selected) if sel]
@@ -571,44 +1052,62 @@ class FigmaImageExporter:
         ]
         
         current_pos = 0
+        full_redraw = True
+        dirty_rows = set()
+        
+        def draw_row(i):
+            """設定項目を1行だけ描画"""
+            label, key = settings_items[i]
+            y = 4 + i * 2
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            if i == current_pos:
+                stdscr.addstr(y, 4, f"► {label}", curses.A_REVERSE)
+            else:
+                stdscr.addstr(y, 4, f"  {label}")
+            
+            # 現在の値を表示
+            if key == "figma_token":
+                value = "設定済み" if self.figma_token else "未設定"
+            elif key == "urls_file":
+                value = self.urls_file
+            elif key == "output_file":
+                value = self.output_file
+            elif key == "assets_dir":
+                value = self.assets_dir
+            elif key in ["save", "back"]:
+                value = ""
+            else:
+                value = ""
+            
+            if value:
+                stdscr.addstr(y, 30, f": {value}")
         
         while True:
-            stdscr.clear()
             height, width = stdscr.getmaxyx()
             
-            # タイトル
-            title = "⚙️ 設定"
-            stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
-            
-            # 設定項目表示
-            for i, (label, key) in enumerate(settings_items):
-                y = 4 + i * 2
-                if i == current_pos:
-                    stdscr.addstr(y, 4, f"► {label}", curses.A_REVERSE)
-                else:
-                    stdscr.addstr(y, 4, f"  {label}")
+            if full_redraw:
+                stdscr.clear()
                 
-                # 現在の値を表示
-                if key == "figma_token":
-                    value = "設定済み" if self.figma_token else "未設定"
-                elif key == "urls_file":
-                    value = self.urls_file
-                elif key == "output_file":
-                    value = self.output_file
-                elif key == "assets_dir":
-                    value = self.assets_dir
-                elif key in ["save", "back"]:
-                    value = ""
-                else:
-                    value = ""
+                # タイトル
+                title = "⚙️ 設定"
+                stdscr.addstr(1, (width - len(title)) // 2, title, curses.A_BOLD)
                 
-                if value:
-                    stdscr.addstr(y, 30, f": {value}")
-            
-            # キー操作ヘルプ
-            help_y = height - 3
-            stdscr.addstr(help_y, 4, "j/k: 上下移動, Space/Enter: 選択, q: 戻る", curses.A_DIM)
+                # 設定項目表示
+                for i in range(len(settings_items)):
+                    draw_row(i)
+                
+                # キー操作ヘルプ
+                help_y = height - 3
+                stdscr.addstr(help_y, 4, "j/k: 上下移動, Space/Enter: 選択, q: 戻る", curses.A_DIM)
+                
+                full_redraw = False
+            else:
+                # カーソル移動で変化した行だけを描き直す
+                for i in dirty_rows:
+                    draw_row(i)
             
+            dirty_rows = set()
             stdscr.refresh()
             
             # キー入力処理
@@ -617,9 +1116,15 @@ class FigmaImageExporter:
             if key == ord('q') or key == ord('Q'):
                 break
             elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos + 1) % len(settings_items)
+                dirty_rows.add(current_pos)
             elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
+                dirty_rows.add(current_pos)
                 current_pos = (current_pos - 1) % len(settings_items)
+                dirty_rows.add(current_pos)
+            elif key == curses.KEY_RESIZE:
+                full_redraw = True
             elif key == ord('\n') or key == 10 or key == ord(' '):
                 selected_key = settings_items[current_pos][1]
                 if selected_key == "back":
@@ -640,8 +1145,9 @@ class FigmaImageExporter:
                         elif selected_key == "output_file":
                             self.output_file = new_value
                         elif selected_key == "assets_dir":
-                            self.assets_dir = new_value
-                            Path(self.assets_dir).mkdir(exist_ok=True)
+                            self.set_assets_dir(new_value)
+                # メッセージや入力ダイアログを消すため全体を描き直す
+                full_redraw = True
     
     def curses_input_dialog(self, stdscr, prompt):
         """入力ダイアログ（curses版）"""
@@ -736,6 +1242,12 @@ class FigmaImageExporter:
     
     def run_fallback(self):
         """フォールバック: 通常のメニュー"""
+        from rich.align import Align
+        from rich.panel import Panel
+        from rich.prompt import Prompt, Confirm
+        from rich.table import Table
+        from rich.text import Text
+        
         self.console.print("[yellow]TUIモードでエラーが発生しました。CLIモードに切り替えます。[/yellow]")
         
         while True:
@@ -779,28 +1291,34 @@ class FigmaImageExporter:
                     if image_data:
                         self.save_image_urls(image_data)
                     
-                    input("\nエンターキーで続行...")
+                    _pause()
                     
                 elif choice == "2":
                     # 選択して画像をダウンロード
                     try:
-                        with open(self.output_file, 'r', encoding='utf-8') as f:
-                            image_data = json.load(f)
+                        image_data = self._load_image_data()
                         
                         if not image_data:
                             self.console.print("[yellow]画像データがありません[/yellow]")
-                            input("\nエンターキーで続行...")
+                            _pause()
                             continue
                         
-                        # 簡単な選択インターフェース
+                        # 一覧を1回だけ表示し、番号指定でまとめて選択する
                         self.console.print("\n[bold cyan]画像を選択してください:[/bold cyan]")
-                        selected_items = []
+                        list_table = Table(show_header=False, box=None, padding=(0, 1))
+                        list_table.add_column("No", style="cyan", justify="right")
+                        list_table.add_column("Name", style="white")
+                        for i, item in enumerate(image_data, 1):
+                            list_table.add_row(str(i), item.get('name', 'Unknown'))
+                        self.console.print(list_table)
                         
-                        for i, item in enumerate(image_data):
-                            name = item.get('name', 'Unknown')
-                            select = Confirm.ask(f"  {i+1}. {name} をダウンロードしますか？", default=False)
-                            if select:
-                                selected_items.append(item)
+                        while True:
+                            answer = Prompt.ask("ダウンロードする番号（例: 1,3,5-7 / all, 空でキャンセル）", default="", show_default=False)
+                            try:
+                                selected_items = [image_data[i] for i in _parse_selection(answer, len(image_data))]
+                                break
+                            except ValueError:
+                                self.console.print("[red]番号の指定が正しくありません[/red]")
                         
                         if selected_items:
                             self.console.print(f"\n[bold cyan]{len(selected_items)} 個の画像をダウンロード中...[/bold cyan]")
@@ -813,17 +1331,16 @@ class FigmaImageExporter:
                     except json.JSONDecodeError:
                         self.console.print(f"[red]エラー: {self.output_file} のJSONフォーマットが正しくありません。[/red]")
                     
-                    input("\nエンターキーで続行...")
+                    _pause()
                     
                 elif choice == "3":
                     # すべてをダウンロード
                     try:
-                        with open(self.output_file, 'r', encoding='utf-8') as f:
-                            image_data = json.load(f)
+                        image_data = self._load_image_data()
                         
                         if not image_data:
                             self.console.print("[yellow]ダウンロードする画像がありません[/yellow]")
-                            input("\nエンターキーで続行...")
+                            _pause()
                             continue
                         
                         # 確認
@@ -838,7 +1355,7 @@ class FigmaImageExporter:
                     except json.JSONDecodeError:
                         self.console.print(f"[red]エラー: {self.output_file} のJSONフォーマットが正しくありません。[/red]")
                     
-                    input("\nエンターキーで続行...")
+                    _pause()
                     
                 elif choice == "4":
                     # 設定変更
@@ -858,14 +1375,13 @@ class FigmaImageExporter:
                     
                     new_assets_dir = Prompt.ask("Assets Directory", default=self.assets_dir)
                     if new_assets_dir:
-                        self.assets_dir = new_assets_dir
-                        Path(self.assets_dir).mkdir(exist_ok=True)
+                        self.set_assets_dir(new_assets_dir)
                     
                     if Confirm.ask("設定を保存しますか？", default=True):
                         self.save_config()
                         self.console.print("[green]✓ 設定を保存しました[/green]")
                     
-                    input("\nエンターキーで続行...")
+                    _pause()
                     
                 elif choice == "5":
                     self.console.print("\n[bold green]終了します。お疲れ様でした！[/bold green]")
@@ -876,7 +1392,7 @@ class FigmaImageExporter:
                 break
             except Exception as e:
                 self.console.print(f"\n[red]エラーが発生しました: {e}[/red]")
-                input("\nエンターキーで続行...")
+                _pause()
 
 
 def main():
@@ -886,9 +1402,12 @@ def main():
     parser.add_argument("--output-file", default="figma_images.json", help="出力ファイルのパス")
     parser.add_argument("--assets-dir", default="assets", help="アセットディレクトリのパス")
     parser.add_argument("--token", help="Figma Token (環境変数 FIGMA_TOKEN または設定ファイルからも取得可能)")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help=f"画像ダウンロードの同時実行数 (デフォルト: {DOWNLOAD_WORKERS})")
     
     args = parser.parse_args()
     
+    from rich.console import Console
+    
     # 環境変数からトークンを取得
     figma_token = args.token or os.getenv("FIGMA_TOKEN")
     
@@ -897,7 +1416,8 @@ def main():
         figma_token=figma_token,
         urls_file=args.urls_file,
         output_file=args.output_file,
-        assets_dir=args.assets_dir
+        assets_dir=args.assets_dir,
+        max_workers=args.workers
     )
     
     # トークンが設定されていない場合の警告
@@ -909,6 +1429,10 @@ def main():
         console.print("[cyan]2. 引数: --token your_token_here[/cyan]")
         console.print("[cyan]3. 設定ファイル: figma_config.json[/cyan]")
         console.print()
+    elif not _TOKEN_RE.fullmatch(app.figma_token):
+        console = Console()
+        console.print("[yellow]⚠️  FIGMA_TOKENの形式が正しくありません。TUIの設定画面で確認してください[/yellow]")
+        console.print()
     
     try:
         app.run()